@@ -0,0 +1,146 @@
+import atexit
+import os
+import sqlite3
+import threading
+
+from loguru import logger
+
+try:
+    # orjson is considerably faster, but the standard library is fine as well
+    import orjson as json
+except ImportError:
+    import json
+
+import lib.config as config
+
+CACHE_FILE = os.path.abspath(os.path.join(config.BASE_FOLDER, "cache.db"))
+# the cache file used before the database, no longer read
+OLD_CACHE_FILE = os.path.abspath(
+    os.path.join(config.BASE_FOLDER, "manifest_cache.json")
+)
+
+# mods are parsed from several threads, which share the one connection
+_connection = None
+_lock = threading.Lock()
+_changed = False
+
+
+def _connect():
+    """Opens the cache database and creates the table if needed."""
+    connection = sqlite3.connect(CACHE_FILE, check_same_thread=False)
+    try:
+        # the cache can always be rebuilt, so durability is not worth much
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, json BLOB)"
+        )
+        connection.commit()
+    except sqlite3.Error:
+        connection.close()
+        raise
+
+    return connection
+
+
+def load():
+    """Opens the cache database on disk, creating it if it does not exist."""
+    global _connection
+
+    logger.debug("Loading cache database {}".format(CACHE_FILE))
+
+    try:
+        os.remove(OLD_CACHE_FILE)
+    except OSError:
+        pass
+
+    try:
+        _connection = _connect()
+        return
+    except sqlite3.DatabaseError:
+        # a corrupt cache is not worth failing over, it will be rebuilt
+        logger.exception("Cache database could not be loaded, recreating it")
+
+    _connection = None
+    for path in (CACHE_FILE, CACHE_FILE + "-wal", CACHE_FILE + "-shm"):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    try:
+        _connection = _connect()
+    except sqlite3.Error:
+        logger.exception("Cache database could not be created")
+
+
+def save():
+    """Commits the cache database to disk, if anything changed.
+    This ends the write transaction, so other instances can write again."""
+    global _changed
+
+    if _connection is None or not _changed:
+        return
+
+    logger.debug("Saving cache database {}".format(CACHE_FILE))
+
+    try:
+        with _lock:
+            _connection.commit()
+            _changed = False
+    except sqlite3.Error:
+        logger.exception("Cache database could not be saved")
+
+
+def get(path, mtime, size):
+    """Returns the cached data for a file path.
+    Returns None if nothing is cached, or the file has changed since."""
+    if _connection is None:
+        return None
+
+    try:
+        with _lock:
+            row = _connection.execute(
+                "SELECT json FROM files WHERE path = ? AND mtime = ? AND size = ?",
+                (path, mtime, size),
+            ).fetchone()
+    except sqlite3.Error:
+        logger.exception("Cache database could not be read")
+        return None
+
+    if row is None:
+        return None
+
+    return json.loads(row[0])
+
+
+def put(path, mtime, size, data):
+    """Stores data for a file path, along with the file's mtime and size."""
+    global _changed
+
+    if _connection is None:
+        return
+
+    data = json.dumps(data)
+    # the standard library returns a string, orjson returns bytes
+    if isinstance(data, str):
+        data = data.encode("utf8")
+
+    try:
+        with _lock:
+            # kept in the open transaction, save commits all of them at once
+            # after each load of the mods
+            _connection.execute(
+                "INSERT OR REPLACE INTO files (path, mtime, size, json) "
+                "VALUES (?, ?, ?, ?)",
+                (path, mtime, size, data),
+            )
+            _changed = True
+    except sqlite3.Error:
+        logger.exception("Cache database could not be written")
+
+
+load()
+# in case anything was stored outside of a load of the mods
+atexit.register(save)
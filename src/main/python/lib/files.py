@@ -1,3 +1,5 @@
+import concurrent.futures
+import functools
 import hashlib
 import os
 import re
@@ -5,6 +7,9 @@ import shutil
 import stat
 import subprocess
 import sys
+import threading
+import zipfile
+import zlib
 
 import patoolib
 from loguru import logger
@@ -21,12 +26,25 @@ ARCHIVE_VERBOSITY = -1
 ARCHIVE_INTERACTIVE = False
 HASH_FILE = "sha256.txt"
 
+# https://stackoverflow.com/a/50924863
+LONG_PATH_PREFIX = "\\\\?\\"
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# robocopy exit codes of 8 and above indicate a failure
+ROBOCOPY_FAILURE = 8
+
 TEMP_FOLDER = os.path.abspath(
     os.path.join(os.getenv("LOCALAPPDATA"), "Temp", "MSFS Mod Manager")
 )
 
-if not os.path.exists(config.BASE_FOLDER):
-    os.makedirs(config.BASE_FOLDER)
+os.makedirs(config.BASE_FOLDER, exist_ok=True)
+
+
+_copy_buffers = threading.local()
+
+# the mod install folder that is known to exist
+_created_mod_install_folder = None
 
 
 class ExtractionError(Exception):
@@ -50,27 +68,32 @@ class move_folder_thread(thread.base_thread):
 
 def fix_path(path):
     """Prepends magic prefix for a path name that is too long"""
-    # https://stackoverflow.com/a/50924863
     # this is truly voodoo magic
-    magic = "\\\\?\\"
-
     path = os.path.normpath(path)
     # some semblance of OS-compatibility for those Linux Proton folks
-    if os.name == "nt" and not path.startswith(magic):
-        return magic + path
+    if os.name == "nt" and not path.startswith(LONG_PATH_PREFIX):
+        return LONG_PATH_PREFIX + path
     else:
         return path
 
 
 def fix_permissions(path):
     """Fixes the permissions of a folder or file so that it can be deleted."""
-    if not os.path.exists(path):
+    try:
+        mode = os.stat(path, follow_symlinks=False).st_mode
+    except FileNotFoundError:
         logger.warning("Path {} does not exist".format(path))
         return
 
-    # logger.debug("Applying stat.S_IWUSR permission to {}".format(path))
+    _add_write_permission(path, mode)
+
+
+def _add_write_permission(path, mode):
+    """Adds the stat.S_IWUSR permission to a path, if it is missing."""
     # fix deletion permission https://blog.nathanv.me/posts/python-permission-issue/
-    os.chmod(path, stat.S_IWUSR)
+    if not mode & stat.S_IWUSR:
+        # logger.debug("Applying stat.S_IWUSR permission to {}".format(path))
+        os.chmod(path, mode | stat.S_IWUSR)
 
 
 def fix_permissions_recursive(folder, update_func=None):
@@ -84,11 +107,20 @@ def fix_permissions_recursive(folder, update_func=None):
 
     logger.debug("Fixing permissions for {}".format(folder))
 
-    for root, dirs, files in os.walk(folder):
-        for d in dirs:
-            fix_permissions(os.path.join(root, d))
-        for f in files:
-            fix_permissions(os.path.join(root, f))
+    stack = [folder]
+    while stack:
+        # skip folders that cannot be read, like os.walk does
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                _add_write_permission(
+                    entry.path, entry.stat(follow_symlinks=False).st_mode
+                )
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
 
 
 def listdir_dirs(folder, full_paths=False):
@@ -98,9 +130,10 @@ def listdir_dirs(folder, full_paths=False):
         logger.warning("Folder {} does not exist".format(folder))
         return []
 
-    result = [
-        item for item in os.listdir(folder) if os.path.isdir(os.path.join(folder, item))
-    ]
+    # DirEntry.is_dir uses the information from the directory listing.
+    # Symlinks are followed, as enabled mods are linked into the sim
+    with os.scandir(folder) as it:
+        result = [entry.name for entry in it if entry.is_dir()]
 
     if full_paths:
         result = [os.path.join(folder, item) for item in result]
@@ -210,15 +243,44 @@ def get_folder_size(folder):
     """Return the size in bytes of a folder, recursively."""
     # logger.debug("Returning size of {} recursively".format(folder))
 
-    if not os.path.isdir(folder):
+    try:
+        folder_stat = os.stat(folder)
+    except OSError:
+        folder_stat = None
+
+    if folder_stat is None or not stat.S_ISDIR(folder_stat.st_mode):
         logger.warning("Folder {} does not exist".format(folder))
         return 0
 
-    return sum(
-        os.path.getsize(os.path.join(dirpath, filename))
-        for dirpath, _, filenames in os.walk(folder)
-        for filename in filenames
-    )
+    # the folder's mtime changes when its contents are added to or removed
+    return _get_folder_size_cached(folder, folder_stat.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_folder_size_cached(folder, mtime):
+    """Return the size in bytes of a folder, recursively.
+    Cached on the folder path and mtime."""
+    # scandir caches the stat info of each entry, so every file
+    # only costs one syscall
+    total = 0
+    stack = [folder]
+    # bind the lookups of the inner loop locally
+    scandir = os.scandir
+    push = stack.append
+    pop = stack.pop
+    while stack:
+        try:
+            it = scandir(pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    push(entry.path)
+                else:
+                    total += entry.stat(follow_symlinks=False).st_size
+
+    return total
 
 
 def delete_file(file, first=True, update_func=None):
@@ -254,21 +316,71 @@ def delete_file(file, first=True, update_func=None):
         delete_file(file, first=False, update_func=update_func)
 
 
+def _delete_entry(path, is_dir):
+    """Deletes a file or folder, fixing permissions and retrying once on failure."""
+    # a linked folder, such as a junction, only has the link itself removed
+    is_link = is_dir and is_symlink(path)
+    if is_link:
+        delete = os.rmdir
+    elif is_dir:
+        delete = shutil.rmtree
+    else:
+        delete = os.unlink
+
+    try:
+        delete(path)
+    except PermissionError:
+        logger.debug(
+            "Deletion of {} failed, attempting to fix permissions".format(path)
+        )
+        if is_dir and not is_link:
+            fix_permissions_recursive(path)
+        else:
+            fix_permissions(path)
+
+        try:
+            delete(path)
+        except PermissionError:
+            logger.error("Not first attempt, raising exception")
+            raise AccessError(path)
+
+
+def _parallel_rmtree(folder):
+    """Deletes a folder, deleting its contents from a pool of threads."""
+    # refuse links, like shutil.rmtree does, rather than deleting the linked
+    # contents. This also covers the junctions created by create_symlink,
+    # which os.path.islink does not detect
+    if is_symlink(folder):
+        raise OSError("Cannot delete the contents of a symbolic link {}".format(folder))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+        with os.scandir(folder) as it:
+            futures = [
+                executor.submit(
+                    _delete_entry, entry.path, entry.is_dir(follow_symlinks=False)
+                )
+                for entry in it
+            ]
+
+    # raise the first error, if any
+    for future in futures:
+        future.result()
+
+    os.rmdir(folder)
+
+
 def delete_folder(folder, first=True, update_func=None):
     """Deletes a folder if it exists."""
     folder = fix_path(folder)
 
-    # check if it exists
-    if not os.path.isdir(folder):
-        logger.debug("Folder {} does not exist".format(folder))
-        return
-
+    # many callers delete speculatively, so no existence check is done beforehand.
+    # A missing folder is handled when the deletion fails instead
     try:
         logger.debug("Attempting to delete folder {}".format(folder))
         # try to delete it
         if update_func:
             update_func("Deleting folder {}".format(folder))
-        shutil.rmtree(folder, ignore_errors=False)
+        _parallel_rmtree(folder)
     except PermissionError:
         logger.info("Folder deletion failed")
         # if there is a permission error
@@ -281,12 +393,144 @@ def delete_folder(folder, first=True, update_func=None):
             # otherwise, try to fix permissions and try again
             fix_permissions_recursive(folder, update_func=update_func)
             delete_folder(folder, first=False, update_func=update_func)
+    except NotADirectoryError:
+        logger.debug("Folder {} does not exist".format(folder))
     except FileNotFoundError as e:
+        if e.filename == folder:
+            logger.debug("Folder {} does not exist".format(folder))
+            return
+
         logger.exception(e)
         # try again
         delete_folder(folder, first=False, update_func=update_func)
 
 
+def _robocopy(src, dest):
+    """Copies a directory tree with robocopy, if available.
+    Returns whether the copy succeeded."""
+    if os.name != "nt" or not shutil.which("robocopy"):
+        return False
+
+    # robocopy handles long paths by itself and does not understand the prefix
+    def strip_prefix(path):
+        if path.startswith(LONG_PATH_PREFIX):
+            return path[len(LONG_PATH_PREFIX) :]
+        return path
+
+    process = subprocess.run(
+        [
+            "robocopy",
+            strip_prefix(src),
+            strip_prefix(dest),
+            "/E",
+            "/SL",
+            # fail on a locked file instead of retrying for days by default
+            "/R:0",
+            "/W:0",
+            "/MT:64",
+            "/NFL",
+            "/NDL",
+            "/NJH",
+            "/NJS",
+            "/NP",
+        ],
+        check=False,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    if process.returncode >= ROBOCOPY_FAILURE:
+        logger.warning(
+            "robocopy failed with exit code {}, falling back".format(process.returncode)
+        )
+        return False
+
+    return True
+
+
+def _copy_file_buffered(fsrc, fdest):
+    """Copies the rest of one open file to another, with a reusable buffer."""
+    # each thread keeps its own buffer, rather than allocating one per file
+    buffer = getattr(_copy_buffers, "buffer", None)
+    if buffer is None:
+        buffer = _copy_buffers.buffer = bytearray(COPY_BUFFER_SIZE)
+
+    view = memoryview(buffer)
+    for n in iter(lambda: fsrc.readinto(view), 0):
+        fdest.write(view[:n])
+
+
+def _fast_copy(src, dest):
+    """Copies a file and its metadata, letting the kernel copy the data if possible.
+    Drop-in replacement for shutil.copy2."""
+    if sys.platform == "win32":
+        # CopyFile also copies the attributes and timestamps
+        win32file.CopyFile(src, dest, 0)
+        return dest
+
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdest:
+        copied = 0
+        if hasattr(os, "sendfile"):
+            size = os.fstat(fsrc.fileno()).st_size
+            try:
+                while copied < size:
+                    sent = os.sendfile(
+                        fdest.fileno(), fsrc.fileno(), copied, size - copied
+                    )
+                    if sent == 0:
+                        break
+                    copied += sent
+            except OSError:
+                # not every platform can sendfile between regular files
+                if copied:
+                    raise
+
+        if not copied:
+            _copy_file_buffered(fsrc, fdest)
+
+    shutil.copystat(src, dest)
+    return dest
+
+
+def _parallel_copytree(src, dest):
+    """Copies a directory tree, copying the files from a pool of threads.
+    Falls back to shutil.copytree if the tree contains any symlinks."""
+    # first pass, collect the directories and files to copy
+    dirs = [dest]
+    jobs = []
+    stack = [(src, dest)]
+    while stack:
+        src_dir, dest_dir = stack.pop()
+        with os.scandir(src_dir) as it:
+            for entry in it:
+                if entry.is_symlink():
+                    logger.debug("Symlink found in {}, copying serially".format(src))
+                    shutil.copytree(src, dest, symlinks=True, copy_function=_fast_copy)
+                    return
+
+                dest_path = os.path.join(dest_dir, entry.name)
+                if entry.is_dir():
+                    dirs.append(dest_path)
+                    stack.append((entry.path, dest_path))
+                else:
+                    jobs.append((entry.path, dest_path))
+
+    # create the directory skeleton
+    for d in dirs:
+        os.makedirs(d, exist_ok=True)
+
+    # copy the files
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=(os.cpu_count() or 1) * 4
+    ) as executor:
+        futures = [executor.submit(_fast_copy, s, d) for s, d in jobs]
+        concurrent.futures.wait(futures)
+
+    # raise the first error, if any
+    for future in futures:
+        future.result()
+
+
 def copy_folder(src, dest, update_func=None):
     """Copies a folder if it exists."""
     src = fix_path(src)
@@ -315,7 +559,11 @@ def copy_folder(src, dest, update_func=None):
         )
 
     logger.debug("Attempting to copy folder {} to {}".format(src, dest))
-    shutil.copytree(src, dest, symlinks=True)
+    if not _robocopy(src, dest):
+        # a failed robocopy leaves a partial copy behind, which copytree
+        # refuses to copy over, and read-only files cannot be overwritten
+        delete_folder(dest, update_func=update_func)
+        _parallel_copytree(src, dest)
 
 
 def move_folder(src, dest, update_func=None):
@@ -330,6 +578,23 @@ def move_folder(src, dest, update_func=None):
         return
 
     logger.debug("Moving folder {} to {}".format(src, dest))
+
+    # on the same volume, a rename avoids rewriting all of the data
+    try:
+        same_volume = os.stat(src).st_dev == os.stat(os.path.dirname(dest)).st_dev
+    except OSError:
+        same_volume = False
+
+    if same_volume:
+        delete_folder(dest, update_func=update_func)
+        try:
+            if update_func:
+                update_func("Moving {} to {}".format(src, dest))
+            os.replace(src, dest)
+            return
+        except OSError:
+            logger.debug("Rename failed, falling back to copy and delete")
+
     copy_folder(src, dest, update_func=update_func)
     delete_folder(src, update_func=update_func)
 
@@ -347,7 +612,7 @@ def create_tmp_folder(update_func=None):
     """Deletes existing temp folder if it exists and creates a new one."""
     delete_folder(TEMP_FOLDER, update_func=update_func)
     logger.debug("Creating temp folder {}".format(TEMP_FOLDER))
-    os.makedirs(TEMP_FOLDER)
+    os.makedirs(TEMP_FOLDER, exist_ok=True)
 
 
 def get_last_open_folder():
@@ -371,9 +636,12 @@ def get_mod_install_folder():
 
     mod_install_folder = fix_path(value)
 
-    if not os.path.exists(mod_install_folder):
+    # this is called for nearly every mod, so only create the folder once
+    global _created_mod_install_folder
+    if mod_install_folder != _created_mod_install_folder:
         logger.debug("Creating mod install folder {}".format(mod_install_folder))
-        os.makedirs(mod_install_folder)
+        os.makedirs(mod_install_folder, exist_ok=True)
+        _created_mod_install_folder = mod_install_folder
 
     return mod_install_folder
 
@@ -392,21 +660,80 @@ def extract_archive(archive, folder, update_func=None):
     try:
         # rar archives will not work without this
         os.makedirs(folder, exist_ok=True)
-        # run the extraction program
-        patoolib.extract_archive(
-            archive,
-            outdir=folder,
-            verbosity=ARCHIVE_VERBOSITY,
-            interactive=ARCHIVE_INTERACTIVE,
-        )
 
-    except patoolib.util.PatoolError as e:
+        # extract in-process if possible, and only then run the extraction program
+        if not _extract_in_process(archive, folder):
+            patoolib.extract_archive(
+                archive,
+                outdir=folder,
+                verbosity=ARCHIVE_VERBOSITY,
+                interactive=ARCHIVE_INTERACTIVE,
+            )
+
+    except (patoolib.util.PatoolError, zipfile.BadZipFile) as e:
         logger.exception("Unable to extract archive")
         raise ExtractionError(str(e))
 
     return folder
 
 
+def _extract_in_process(archive, folder):
+    """Extracts an archive without an external program, where possible.
+    Returns whether the archive was extracted."""
+    if not zipfile.is_zipfile(archive):
+        return False
+
+    try:
+        # the extraction program handled long paths, so keep them working
+        _extract_zip(archive, fix_path(folder))
+        return True
+    except (NotImplementedError, RuntimeError, OSError, zlib.error):
+        # such as zip files using deflate64 or encryption,
+        # which the extraction program can handle or report
+        logger.exception("Unable to extract archive in-process, falling back")
+        # start over with an empty folder
+        delete_folder(folder)
+        os.makedirs(folder, exist_ok=True)
+
+    return False
+
+
+def _extract_zip_members(archive, members, folder):
+    """Extracts the given members of a zip archive."""
+    # each thread uses its own handle, as ZipFile objects are not thread-safe
+    with zipfile.ZipFile(archive) as zf:
+        for member in members:
+            try:
+                zf.extract(member, folder)
+            except FileExistsError:
+                # another thread created a parent folder in between
+                # ZipFile's existence check and creating it
+                zf.extract(member, folder)
+
+
+def _extract_zip(archive, folder):
+    """Extracts a zip archive, decompressing the members from a pool of threads."""
+    with zipfile.ZipFile(archive) as zf:
+        members = zf.infolist()
+
+    if not members:
+        return
+
+    workers = min(len(members), os.cpu_count() or 1)
+    # interleave the members so each thread gets a similar mix of sizes
+    chunks = [members[i::workers] for i in range(workers)]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_extract_zip_members, archive, chunk, folder)
+            for chunk in chunks
+        ]
+
+    # raise the first error, if any
+    for future in futures:
+        future.result()
+
+
 def create_archive(folder, archive, update_func=None):
     """Creates an archive file and returns the new path."""
     uncomp_size = human_readable_size(get_folder_size(folder))
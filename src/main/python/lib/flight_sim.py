@@ -1,13 +1,27 @@
+import collections
+import concurrent.futures
 import datetime
 import functools
-import json
 import os
+import re
 
 from loguru import logger
 
+try:
+    # orjson is considerably faster, but the standard library is fine as well
+    import orjson as json
+except ImportError:
+    import json
+
+try:
+    # lets a manifest be read only as far as the needed keys
+    import ijson
+except ImportError:
+    ijson = None
+
+import lib.cache as cache
 import lib.config as config
 import lib.files as files
-import lib.thread as thread
 
 
 class LayoutError(Exception):
@@ -30,89 +44,112 @@ class NoModsError(Exception):
     """Raised when no mods are found in an archive."""
 
 
-class install_mods_thread(thread.base_thread):
-    """Setup a thread to install mods with and not block the main thread."""
-
-    def __init__(self, flight_sim_handle, extracted_archive):
-        """Initialize the mod installer thread."""
-        logger.debug("Initialzing mod installer thread")
-        function = lambda: flight_sim_handle.install_mods(
-            extracted_archive,
-            update_func=self.activity_update.emit,
-        )
-        thread.base_thread.__init__(self, function)
-
-
-class install_mod_archive_thread(thread.base_thread):
-    """Setup a thread to install mod archive with and not block the main thread."""
-
-    def __init__(self, flight_sim_handle, mod_archive):
-        """Initialize the mod archive installer thread."""
-        logger.debug("Initialzing mod archive installer thread")
-        function = lambda: flight_sim_handle.install_mod_archive(
-            mod_archive,
-            update_func=self.activity_update.emit,
-            percent_func=self.percent_update.emit,
-        )
-        thread.base_thread.__init__(self, function)
-
-
-class uninstall_mod_thread(thread.base_thread):
-    """Setup a thread to uninstall mods with and not block the main thread."""
-
-    def __init__(
-        self,
-        flight_sim_handle,
-        folder,
-    ):
-        """Initialize the mod uninstaller thread."""
-        logger.debug("Initialzing mod uninstaller thread")
-        function = lambda: flight_sim_handle.uninstall_mod(
-            folder,
-            update_func=self.activity_update.emit,
-        )
-        thread.base_thread.__init__(self, function)
-
-
-class enable_mod_thread(thread.base_thread):
-    """Setup a thread to enable mods with and not block the main thread."""
-
-    def __init__(self, flight_sim_handle, folder):
-        """Initialize the mod enabler thread."""
-        logger.debug("Initialzing mod enabler thread")
-        function = lambda: flight_sim_handle.enable_mod(
-            folder, update_func=self.activity_update.emit
-        )
-        thread.base_thread.__init__(self, function)
-
-
-class disable_mod_thread(thread.base_thread):
-    """Setup a thread to disable mods with and not block the main thread."""
-
-    def __init__(self, flight_sim_handle, archive):
-        """Initialize the mod disabler thread."""
-        logger.debug("Initialzing mod disabler thread")
-        function = lambda: flight_sim_handle.disable_mod(
-            archive, update_func=self.activity_update.emit
-        )
-        thread.base_thread.__init__(self, function)
-
-
-class create_backup_thread(thread.base_thread):
-    """Setup a thread to create backup with and not block the main thread."""
-
-    def __init__(self, flight_sim_handle, archive):
-        """Initialize the backup creator thread."""
-        logger.debug("Initialzing backup creator thread")
-        function = lambda: flight_sim_handle.create_backup(
-            archive, update_func=self.activity_update.emit
-        )
-        thread.base_thread.__init__(self, function)
+# the line of UserCfg.opt with the packages path, matched over the whole file
+USER_CFG_PATH_RE = re.compile(
+    rb"^InstalledPackagesPath[ \t]+(.+?)\s*$", flags=re.MULTILINE
+)
+
+# top-level manifest.json keys, and the mod data keys they are stored as
+MANIFEST_KEYS = {
+    "content_type": "content_type",
+    "title": "title",
+    "manufacturer": "manufacturer",
+    "creator": "creator",
+    "package_version": "version",
+    "minimum_game_version": "minimum_game_version",
+}
+
+JSON_SCALAR_EVENTS = ("string", "number", "boolean", "null")
+
+
+def read_manifest_keys(f):
+    """Reads the needed keys from an open manifest.json file.
+    Returns them as a dictionary keyed by mod data key."""
+    if ijson is None:
+        data = json.loads(f.read())
+        return {value: data.get(key, "") for key, value in MANIFEST_KEYS.items()}
+
+    # stream the file and stop once every key has been seen, rather than
+    # building the dependencies, variations and such only to throw them away
+    found = {}
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if prefix in MANIFEST_KEYS and event in JSON_SCALAR_EVENTS:
+            found[prefix] = value
+            if len(found) == len(MANIFEST_KEYS):
+                break
+
+    return {value: found.get(key, "") for key, value in MANIFEST_KEYS.items()}
+
+
+def env_path(variable, *paths):
+    """Joins paths onto the value of an environment variable.
+    Returns None if the environment variable is not set."""
+    base = os.getenv(variable)
+    if not base:
+        return None
+
+    return os.path.join(base, *paths)
+
+
+# places the sim is usually installed, as (description, folder, is main sim folder).
+# The main sim folder holds the UserCfg.opt pointing to the packages folder,
+# otherwise the folder is the packages folder itself
+SIM_FOLDER_CANDIDATES = [
+    (
+        "default Steam install",
+        env_path("APPDATA", "Microsoft Flight Simulator"),
+        True,
+    ),
+    (
+        "default MS Store install",
+        env_path(
+            "LOCALAPPDATA",
+            "Packages",
+            "Microsoft.FlightSimulator_8wekyb3d8bbwe",
+            "LocalCache",
+        ),
+        True,
+    ),
+    (
+        "default boxed edition install",
+        env_path("LOCALAPPDATA", "MSFSPackages"),
+        False,
+    ),
+    (
+        "last-ditch Steam install #1",
+        env_path(
+            "PROGRAMFILES(x86)",
+            "Steam",
+            "steamapps",
+            "common",
+            "MicrosoftFlightSimulator",
+        ),
+        True,
+    ),
+    (
+        "last-ditch Steam install #2",
+        env_path("PROGRAMFILES(x86)", "Steam", "steamapps", "common", "Chucky"),
+        True,
+    ),
+]
+
+
+@functools.lru_cache(maxsize=8)
+def sim_mod_folder(sim_packages_folder):
+    """Returns the path to the community packages folder inside a sim packages folder.
+    Memoized per packages folder, as resolving the symlink is not free."""
+    return files.fix_path(
+        files.resolve_symlink(os.path.join(sim_packages_folder, "Community"))
+    )
 
 
 class flight_sim:
     def __init__(self):
         self.sim_packages_folder = ""
+        # maps a mod folder to its manifest's (mtime, size) and parsed mod data
+        self._mod_cache = {}
+        # maps the link of an enabled mod to the mod folder it links to
+        self._mod_links = {}
 
     def parse_user_cfg(self, sim_folder=None, filename=None):
         """Parses the given UserCfg.opt file.
@@ -123,32 +160,33 @@ class flight_sim:
         if sim_folder:
             filename = os.path.join(sim_folder, "UserCfg.opt")
 
-        installed_packages_path = ""
+        # the file is small, so read it at once and search it with one regex
+        with open(filename, "rb") as fp:
+            match = USER_CFG_PATH_RE.search(fp.read())
 
-        with open(filename, "r", encoding="utf8") as fp:
-            for line in fp:
-                if line.startswith("InstalledPackagesPath"):
-                    logger.debug("Found InstalledPackagesPath line: {}".format(line))
-                    installed_packages_path = line
+        if not match:
+            logger.error("No InstalledPackagesPath line found")
+            return ""
 
-        # splits the line once, and takes the second instance
-        installed_packages_path = installed_packages_path.split(" ", 1)[1].strip()
+        logger.debug("Found InstalledPackagesPath line: {}", match.group(0))
+
+        installed_packages_path = match.group(1).decode("utf8")
         # normalize the string
         installed_packages_path = installed_packages_path.strip('"').strip("'")
         # evaluate the path
         installed_packages_path = os.path.realpath(installed_packages_path)
 
-        logger.debug("Path parsed: {}".format(installed_packages_path))
+        logger.debug("Path parsed: {}", installed_packages_path)
 
         return installed_packages_path
 
     def is_sim_folder(self, folder):
         """Returns if FlightSimulator.CFG exists inside the given directory.
         Not a perfect test, but a solid guess."""
-        logger.debug("Testing if {} is main MSFS folder".format(folder))
+        logger.debug("Testing if {} is main MSFS folder", folder)
         try:
             status = os.path.isfile(os.path.join(folder, "FlightSimulator.CFG"))
-            logger.debug("Folder {} is main MSFS folder: {}".format(folder, status))
+            logger.debug("Folder {} is main MSFS folder: {}", folder, status)
             return status
         except Exception:
             logger.exception("Checking sim folder status failed")
@@ -158,18 +196,19 @@ class flight_sim:
         """Returns whether the given folder is the FS2020 packages folder.
         Not a perfect test, but a decent guess."""
         # test if the folder above it contains both 'Community' and 'Official'
-        logger.debug("Testing if {} is MSFS sim packages folder".format(folder))
+        logger.debug("Testing if {} is MSFS sim packages folder", folder)
         try:
-            packages_folders = files.listdir_dirs(folder)
-            status = "Official" in packages_folders and "Community" in packages_folders
-            logger.debug(
-                "Folder {} is MSFS sim packages folder: {}".format(folder, status)
+            # two stats are much cheaper than listing a packages folder
+            status = os.path.isdir(os.path.join(folder, "Official")) and os.path.isdir(
+                os.path.join(folder, "Community")
             )
+            logger.debug("Folder {} is MSFS sim packages folder: {}", folder, status)
             return status
         except Exception:
             logger.exception("Checking sim packages folder status failed")
             return False
 
+    @functools.lru_cache(maxsize=1)
     def find_sim_packages_folder(self):
         """Attempts to automatically locate the install location of FS Packages.
         Returns if reading from config file was successful, and
@@ -179,77 +218,34 @@ class flight_sim:
         # first try to read from the config file
         logger.debug("Trying to find simulator path from config file")
         succeed, value = config.get_key_value(config.SIM_FOLDER_KEY, path=True)
-        if succeed and self.is_sim_packages_folder(value):
-            logger.debug("Config file sim path found and valid")
-            return (True, value)
-
-        # steam detection
-        logger.debug("Trying to find simulator path from default Steam install")
-        steam_folder = os.path.join(os.getenv("APPDATA"), "Microsoft Flight Simulator")
-        if self.is_sim_folder(steam_folder):
-            steam_packages_folder = os.path.join(
-                self.parse_user_cfg(sim_folder=steam_folder)
-            )
-            if self.is_sim_packages_folder(steam_packages_folder):
-                logger.debug("Steam sim path found and valid")
-                return (False, steam_packages_folder)
-
-        # ms store detection
-        logger.debug("Trying to find simulator path from default MS Store install")
-        ms_store_folder = os.path.join(
-            os.getenv("LOCALAPPDATA"),
-            "Packages",
-            "Microsoft.FlightSimulator_8wekyb3d8bbwe",
-            "LocalCache",
-        )
-        if self.is_sim_folder(ms_store_folder):
-            ms_store_packages_folder = os.path.join(
-                self.parse_user_cfg(sim_folder=ms_store_folder)
-            )
-            if self.is_sim_packages_folder(ms_store_packages_folder):
-                logger.debug("MS Store sim path found and valid")
-                return (False, ms_store_packages_folder)
-
-        # boxed edition detection
-        logger.debug("Trying to find simulator path from default boxed edition install")
-        boxed_packages_folder = os.path.join(os.getenv("LOCALAPPDATA"), "MSFSPackages")
-        if self.is_sim_packages_folder(boxed_packages_folder):
-            logger.debug("Boxed edition sim path found and valid")
-            return (False, boxed_packages_folder)
-
-        # last ditch steam detection #1
-        logger.debug("Trying to find simulator path from last-ditch Steam install #1")
-        steam_folder = os.path.join(
-            os.getenv("PROGRAMFILES(x86)"),
-            "Steam",
-            "steamapps",
-            "common",
-            "MicrosoftFlightSimulator",
-        )
-        if self.is_sim_folder(steam_folder):
-            steam_packages_folder = os.path.join(
-                self.parse_user_cfg(sim_folder=steam_folder)
-            )
-            if self.is_sim_packages_folder(steam_packages_folder):
-                logger.debug("Last-ditch #1 Steam sim path found and valid")
-                return (False, steam_packages_folder)
-
-        # last ditch steam detection #2
-        logger.debug("Trying to find simulator path from last-ditch Steam install #2")
-        steam_folder = os.path.join(
-            os.getenv("PROGRAMFILES(x86)"),
-            "Steam",
-            "steamapps",
-            "common",
-            "Chucky",
-        )
-        if self.is_sim_folder(steam_folder):
-            steam_packages_folder = os.path.join(
-                self.parse_user_cfg(sim_folder=steam_folder)
-            )
-            if self.is_sim_packages_folder(steam_packages_folder):
-                logger.debug("Last-ditch #2 Steam sim path found and valid")
-                return (False, steam_packages_folder)
+        # remember results, as several candidates can point to the same folder
+        checked = {}
+        if succeed:
+            checked[value] = self.is_sim_packages_folder(value)
+            if checked[value]:
+                logger.debug("Config file sim path found and valid")
+                return (True, value)
+
+        for name, folder, is_main_folder in SIM_FOLDER_CANDIDATES:
+            logger.debug("Trying to find simulator path from {}", name)
+
+            # most candidates do not exist at all, which is cheap to rule out
+            if folder is None or not os.path.isdir(folder):
+                continue
+
+            if is_main_folder:
+                if not self.is_sim_folder(folder):
+                    continue
+                packages_folder = self.parse_user_cfg(sim_folder=folder)
+            else:
+                packages_folder = folder
+
+            if packages_folder not in checked:
+                checked[packages_folder] = self.is_sim_packages_folder(packages_folder)
+
+            if checked[packages_folder]:
+                logger.debug("Sim path from {} found and valid", name)
+                return (False, packages_folder)
 
         # fail
         logger.warning("Simulator path could not be automatically determined")
@@ -259,19 +255,26 @@ class flight_sim:
         """Clears the cache of the mod parsing functions."""
         self.parse_mod_layout.cache_clear()
         self.parse_mod_files.cache_clear()
-        self.parse_mod_manifest.cache_clear()
+        self.parse_real_mod_manifest.cache_clear()
+        self._mod_links.clear()
+        # the mod install folder can change, which changes this mapping
+        self.get_mod_folder.cache_clear()
+        sim_mod_folder.cache_clear()
+
+    def invalidate_mods(self, *folders):
+        """Drops mod folders from the cache of loaded mod data."""
+        for folder in folders:
+            self._mod_cache.pop(folder, None)
+            self._mod_links.pop(folder, None)
 
-    @functools.lru_cache()
     def get_sim_mod_folder(self):
         """Returns the path to the community packages folder inside Flight Simulator.
         Tries to resolve symlinks in every step of the path."""
         # logger.debug("Determining path for sim community packages folder")
 
-        return files.fix_path(
-            files.resolve_symlink(os.path.join(self.sim_packages_folder, "Community"))
-        )
+        return sim_mod_folder(self.sim_packages_folder)
 
-    @functools.lru_cache()
+    @functools.lru_cache(maxsize=None)
     def get_sim_official_folder(self):
         """Returns the path to the official packages folder inside Flight Simulator.
         Tries to resolve symlinks in every step of the path."""
@@ -288,7 +291,7 @@ class flight_sim:
             files.resolve_symlink(os.path.join(official_packages, store))
         )
 
-    @functools.lru_cache()
+    @functools.lru_cache(maxsize=None)
     def get_mod_folder(self, folder, enabled):
         """Returns path to mod folder given folder name and enabled status."""
         # logger.debug("Determining path for mod {}, enabled: {}".format(folder, enabled))
@@ -302,80 +305,96 @@ class flight_sim:
 
         return files.fix_path(mod_folder)
 
-    @functools.lru_cache()
+    @functools.lru_cache(maxsize=32)
     def parse_mod_layout(self, mod_folder):
         """Builds the mod files info as a dictionary. Parsed from the layout.json."""
-        logger.debug("Parsing layout for {}".format(mod_folder))
+        logger.debug("Parsing layout for {}", mod_folder)
 
-        layout_path = files.resolve_symlink(os.path.join(mod_folder, "layout.json"))
+        layout_path = os.path.join(mod_folder, "layout.json")
 
-        if not os.path.isfile(layout_path):
+        # opening the file doubles as the existence check.
+        # Opening follows symlinks already, so only resolve one if that fails
+        try:
+            try:
+                f = open(layout_path, "rb")
+            except FileNotFoundError:
+                f = open(files.resolve_symlink(layout_path), "rb")
+            with f:
+                data = json.loads(f.read())
+        except FileNotFoundError:
             logger.error("No layout.json found")
             raise NoLayoutError(mod_folder)
-
-        try:
-            with open(layout_path, "r", encoding="utf8") as f:
-                data = json.load(f)
         except Exception as e:
             if hasattr(e, "winerror"):
-                logger.exception("WinError: {}".format(e.winerror))
+                logger.exception("WinError: {}", e.winerror)
             logger.exception("layout.json could not be parsed")
             raise LayoutError(e)
 
         return data["content"]
 
-    @functools.lru_cache()
+    @functools.lru_cache(maxsize=32)
     def parse_mod_files(self, mod_folder):
         """Builds the mod files info as a dictionary. Parsed from the fielsystem."""
-        logger.debug("Parsing all mod files for {}".format(mod_folder))
+        logger.debug("Parsing all mod files for {}", mod_folder)
+
+        # entry paths are built from the scanned folder, so slicing off
+        # the prefix gives the relative path without os.path.relpath
+        prefix = os.path.join(mod_folder, "")
+        prefix_len = len(prefix)
 
         data = []
-        for root, _, files_ in os.walk(mod_folder):
-            for file in files_:
-                data.append(
-                    {
-                        "path": os.path.join(os.path.relpath(root, mod_folder), file),
-                        "size": os.path.getsize(os.path.join(root, file)),
-                    }
-                )
+        stack = [prefix]
+        # this runs for every file of every mod, so bind the lookups locally
+        scandir = os.scandir
+        push = stack.append
+        pop = stack.pop
+        add = data.append
+        while stack:
+            with scandir(pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        push(entry.path)
+                    # skips broken and directory symlinks, like os.walk did
+                    elif entry.is_file():
+                        add(
+                            {
+                                "path": entry.path[prefix_len:],
+                                "size": entry.stat().st_size,
+                            }
+                        )
 
         return data
 
-    @functools.lru_cache()
     def parse_mod_manifest(self, mod_folder, enabled=True):
         """Builds the mod metadata as a dictionary. Parsed from the manifest.json."""
-        logger.debug("Parsing manifest for {}".format(mod_folder))
-
         mod_data = {"folder_name": os.path.basename(mod_folder)}
-        manifest_path = files.resolve_symlink(os.path.join(mod_folder, "manifest.json"))
 
-        if not os.path.isfile(manifest_path):
-            logger.error("No manifest.json found")
-            raise NoManifestError(mod_folder)
+        # an enabled mod is a symlink to the disabled one, so parse by the
+        # linked folder to let both share one cached result.
+        # os.path.realpath does not resolve junctions before Python 3.8
+        real_folder = self._mod_links.get(mod_folder, mod_folder)
+        manifest_path = os.path.join(real_folder, "manifest.json")
 
+        # stat follows symlinks already, so only resolve one if that fails
         try:
-            with open(manifest_path, "r", encoding="utf8") as f:
-                data = json.load(f)
-        except Exception as e:
-            if hasattr(e, "winerror"):
-                logger.exception("WinError: {}".format(e.winerror))
-            logger.exception("manifest.json could not be opened/parsed")
-            raise ManifestError(e)
-
-        # manifest data
-        mod_data["content_type"] = data.get("content_type", "")
-        mod_data["title"] = data.get("title", "")
-        mod_data["manufacturer"] = data.get("manufacturer", "")
-        mod_data["creator"] = data.get("creator", "")
-        mod_data["version"] = data.get("package_version", "")
-        mod_data["minimum_game_version"] = data.get("minimum_game_version", "")
+            try:
+                manifest_stat = os.stat(manifest_path)
+            except FileNotFoundError:
+                manifest_path = files.resolve_symlink(manifest_path)
+                manifest_stat = os.stat(manifest_path)
+        except FileNotFoundError:
+            logger.error("No manifest.json found")
+            raise NoManifestError(mod_folder)
 
-        # manifest metadata
-        # Windows considering moving/copying a file 'creating' it again,
-        # and not modifying contents
-        mod_data["time_mod"] = datetime.datetime.fromtimestamp(
-            os.path.getctime(manifest_path)
-        ).strftime("%Y-%m-%d %H:%M:%S")
+        # the stat is part of the cache key, so a changed manifest is parsed again
+        mod_data.update(
+            self.parse_real_mod_manifest(
+                manifest_path,
+                manifest_stat.st_mtime_ns,
+                manifest_stat.st_size,
+                manifest_stat.st_ctime,
+            )
+        )
 
         # convience, often helps to just have this included in the returned result
         # and its easier to to do here
@@ -384,21 +403,57 @@ class flight_sim:
 
         return mod_data
 
+    @functools.lru_cache(maxsize=256)
+    def parse_real_mod_manifest(self, manifest_path, mtime, size, ctime):
+        """Builds the mod metadata shared by all paths to a mod folder.
+        Parsed from the manifest.json, with the given stat info."""
+        logger.debug("Parsing manifest {}", manifest_path)
+
+        mod_data = {}
+
+        # manifests rarely change, so reuse the data parsed in a previous session
+        manifest_data = cache.get(manifest_path, mtime, size)
+
+        if manifest_data is None:
+            try:
+                with open(manifest_path, "rb") as f:
+                    manifest_data = read_manifest_keys(f)
+            except Exception as e:
+                if hasattr(e, "winerror"):
+                    logger.exception("WinError: {}", e.winerror)
+                logger.exception("manifest.json could not be opened/parsed")
+                raise ManifestError(e)
+
+            cache.put(manifest_path, mtime, size, manifest_data)
+
+        # manifest data
+        mod_data.update(manifest_data)
+
+        # manifest metadata
+        # Windows considering moving/copying a file 'creating' it again,
+        # and not modifying contents.
+        # The stat from above already has this, no need to stat again
+        mod_data["time_mod"] = datetime.datetime.fromtimestamp(ctime).isoformat(
+            sep=" ", timespec="seconds"
+        )
+
+        return mod_data
+
     def get_game_version(self):
         """Attempts to guess the game's version.
         This is based on the fs-base package and the minimum game version listed."""
         logger.debug("Attempting to determine game version")
         version = "???"
         # build path to fs-base manifest
-        fs_base = files.resolve_symlink(
-            os.path.join(self.get_sim_official_folder(), "fs-base")
-        )
+        fs_base = os.path.join(self.get_sim_official_folder(), "fs-base")
+        if not os.path.isdir(fs_base):
+            fs_base = files.resolve_symlink(fs_base)
         # parse it if we guessed correct
         if os.path.isdir(fs_base):
             data = self.parse_mod_manifest(fs_base)
             version = data["minimum_game_version"]
 
-        logger.debug("Game version: {}".format(version))
+        logger.debug("Game version: {}", version)
         return version
 
     def get_mods(self, folders, enabled, progress_func=None, start=0):
@@ -407,18 +462,17 @@ class flight_sim:
         mods = []
         errors = []
 
-        for i, folder in enumerate(folders):
-            if progress_func:
-                progress_func(
-                    "Loading mods: {}".format(folder),
-                    start + i,
-                    start + len(folders) - 1,
-                )
-
+        # clean up empty folders and broken symlinks before parsing
+        mod_folders = []
+        for folder in folders:
             try:
                 if not os.listdir(folder):
-                    # if the mod folder is completely empty, just delete it
-                    files.delete_folder(folder)
+                    # if the mod folder is completely empty, just delete it.
+                    # A link to an empty folder only has the link removed
+                    if files.is_symlink(folder):
+                        files.delete_symlink(folder)
+                    else:
+                        files.delete_folder(folder)
                     continue
             except FileNotFoundError:
                 # in the case of a broken symlink, this will trigger an error
@@ -426,32 +480,94 @@ class flight_sim:
                 files.delete_symlink(folder)
                 continue
 
-            # parse each mod
+            mod_folders.append(folder)
+
+        def parse(folder):
+            # reuse the data from the last load if the manifest is unchanged on disk
             try:
-                mods.append(self.parse_mod_manifest(folder, enabled=enabled))
+                manifest_stat = os.stat(os.path.join(folder, "manifest.json"))
+                key = (manifest_stat.st_mtime_ns, manifest_stat.st_size)
+            except OSError:
+                key = None
+
+            cached = self._mod_cache.get(folder)
+            if key is not None and cached is not None and cached[0] == key:
+                # a copy, so callers can never change the cached data
+                return dict(cached[1])
+
+            # the parse stats the manifest again after the stat above, so the result
+            # is never older than the key it is stored under
+            try:
+                mod_data = self.parse_mod_manifest(folder, enabled=enabled)
             except (NoManifestError, ManifestError):
+                return None
+
+            if key is not None:
+                self._mod_cache[folder] = (key, dict(mod_data))
+            return mod_data
+
+        # parsing is I/O bound, so parse the manifests from a pool of threads
+        results = [None] * len(mod_folders)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 1) * 4)
+        ) as executor:
+            futures = {
+                executor.submit(parse, folder): i
+                for i, folder in enumerate(mod_folders)
+            }
+
+            # report progress as each mod finishes, rather than in order
+            for done, future in enumerate(concurrent.futures.as_completed(futures)):
+                i = futures[future]
+                results[i] = future.result()
+
+                if progress_func:
+                    progress_func(
+                        "Loading mods: {}".format(mod_folders[i]),
+                        start + done,
+                        start + len(mod_folders) - 1,
+                    )
+
+        # keep the results in the original folder order
+        for folder, mod_data in zip(mod_folders, results):
+            if mod_data is None:
                 errors.append(folder)
+            else:
+                mods.append(mod_data)
 
         return mods, errors
 
-    def get_all_mods(self, progress_func=None):
-        """Returns data and errors for all mods."""
+    def get_all_mods(self, progress_func=None, force=False):
+        """Returns data and errors for all mods.
+        Mods with unchanged manifests are not parsed again, unless forced."""
+        if force:
+            self._mod_cache.clear()
+
+        mod_install_folder = files.get_mod_install_folder()
 
         enabled_mod_folders = files.listdir_dirs(
             self.get_sim_mod_folder(), full_paths=True
         )
-        disabled_mod_folders = files.listdir_dirs(
-            files.get_mod_install_folder(), full_paths=True
-        )
+        disabled_mod_folders = files.listdir_dirs(mod_install_folder, full_paths=True)
 
+        # map the enabled mods that are a symlink to their install folders.
+        # The install folders are then a set lookup rather than a scan of the
+        # disabled list, and the manifest is parsed once for both paths
+        self._mod_links = {}
         for folder in enabled_mod_folders:
-            # remove duplicate folders from disabled list if there is a symlink for them
             if files.is_symlink(folder):
-                install_folder = os.path.join(
-                    files.get_mod_install_folder(), os.path.basename(folder)
+                self._mod_links[folder] = os.path.join(
+                    mod_install_folder, os.path.basename(folder)
                 )
-                if install_folder in disabled_mod_folders:
-                    disabled_mod_folders.remove(install_folder)
+        linked_folders = set(self._mod_links.values())
+
+        # remove duplicate folders from disabled list if there is a symlink for them
+        if linked_folders:
+            disabled_mod_folders = [
+                folder
+                for folder in disabled_mod_folders
+                if folder not in linked_folders
+            ]
 
         enabled_mod_data, enabled_mod_errors = self.get_mods(
             enabled_mod_folders, enabled=True, progress_func=progress_func
@@ -463,6 +579,10 @@ class flight_sim:
             start=len(enabled_mod_data) - 1,
         )
 
+        # commit the newly parsed manifests once per load, rather than keeping
+        # the database locked until exit
+        cache.save()
+
         return (
             enabled_mod_data + disabled_mod_data,
             enabled_mod_errors + disabled_mod_errors,
@@ -500,23 +620,35 @@ class flight_sim:
 
     def determine_mod_folders(self, folder, update_func=None):
         """Walks a directory to find the folder(s) with a manifest.json file in them."""
-        logger.debug("Locating mod folders inside {}".format(folder))
+        logger.debug("Locating mod folders inside {}", folder)
         mod_folders = []
 
         if update_func:
             update_func("Locating mods inside {}".format(folder))
 
-        # check the root folder for a manifest
-        if os.path.isfile(os.path.join(folder, "manifest.json")):
-            logger.debug("Mod found {}".format(os.path.join(folder)))
-            mod_folders.append(os.path.join(folder))
-
-        for root, dirs, _ in os.walk(folder):
-            # go through each directory and check for the manifest
-            for d in dirs:
-                if os.path.isfile(os.path.join(root, d, "manifest.json")):
-                    logger.debug("Mod found {}".format(os.path.join(root, d)))
-                    mod_folders.append(os.path.join(root, d))
+        # breadth-first search, as mods are usually near the top of the folder.
+        # A mod never contains another mod, so do not descend into one
+        queue = collections.deque([folder])
+        while queue:
+            current = queue.popleft()
+
+            # a single scan both finds the manifest and lists the subfolders,
+            # without an extra stat per folder
+            is_mod = False
+            subfolders = []
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        subfolders.append(entry.path)
+                    elif entry.name == "manifest.json" and entry.is_file():
+                        is_mod = True
+                        break
+
+            if is_mod:
+                logger.debug("Mod found {}", current)
+                mod_folders.append(current)
+            else:
+                queue.extend(subfolders)
 
         if not mod_folders:
             logger.error("No mods found")
@@ -526,20 +658,19 @@ class flight_sim:
 
     def install_mods(self, folder, update_func=None, delete=False, percent_func=None):
         """Extracts and installs a new mod."""
-        logger.debug("Installing mod {}".format(folder))
+        logger.debug("Installing mod {}", folder)
 
         # determine the mods inside the extracted archive
         mod_folders = self.determine_mod_folders(folder, update_func=update_func)
 
-        installed_mods = []
+        mod_install_folder = files.get_mod_install_folder()
+        community_folder = self.get_sim_mod_folder()
 
-        for i, mod_folder in enumerate(mod_folders):
+        def install(mod_folder):
             # get the base folder name
             base_mod_folder = os.path.basename(mod_folder)
-            install_folder = os.path.join(
-                files.get_mod_install_folder(), base_mod_folder
-            )
-            dest_folder = os.path.join(self.get_sim_mod_folder(), base_mod_folder)
+            install_folder = os.path.join(mod_install_folder, base_mod_folder)
+            dest_folder = os.path.join(community_folder, base_mod_folder)
 
             # copy mod to install dir
             if delete:
@@ -549,11 +680,40 @@ class flight_sim:
 
             # create the symlink to the sim
             files.create_symlink(install_folder, dest_folder)
+            self.invalidate_mods(
+                files.fix_path(install_folder), files.fix_path(dest_folder)
+            )
 
-            if percent_func:
-                percent_func((i, len(mod_folders)))
+            return base_mod_folder
 
-            installed_mods.append(base_mod_folder)
+        # copies of separate mods are independent, so run a few at once.
+        # Moves are usually a rename, and mods with the same name
+        # would install to the same folder, so keep those in order
+        base_names = {os.path.basename(mod_folder) for mod_folder in mod_folders}
+        if delete or len(mod_folders) == 1 or len(base_names) < len(mod_folders):
+            installed_mods = []
+            for i, mod_folder in enumerate(mod_folders):
+                installed_mods.append(install(mod_folder))
+
+                if percent_func:
+                    percent_func((i, len(mod_folders)))
+        else:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(4, len(mod_folders))
+            ) as executor:
+                futures = [
+                    executor.submit(install, mod_folder) for mod_folder in mod_folders
+                ]
+
+                # report progress as each mod finishes, rather than in order
+                for i, future in enumerate(concurrent.futures.as_completed(futures)):
+                    # raises the error of a failed install
+                    future.result()
+
+                    if percent_func:
+                        percent_func((i, len(mod_folders)))
+
+            installed_mods = [future.result() for future in futures]
 
         # clear the cache of the mod function
         self.clear_mod_cache()
@@ -562,7 +722,7 @@ class flight_sim:
 
     def install_mod_archive(self, mod_archive, update_func=None, percent_func=None):
         """Extracts and installs a new mod."""
-        logger.debug("Installing mod {}".format(mod_archive))
+        logger.debug("Installing mod {}", mod_archive)
         # extract the archive
         extracted_archive = self.extract_mod_archive(
             mod_archive, update_func=update_func
@@ -577,24 +737,37 @@ class flight_sim:
 
     def uninstall_mod(self, folder, update_func=None):
         """Uninstalls a mod."""
-        logger.debug("Uninstalling mod {}".format(folder))
+        logger.debug("Uninstalling mod {}", folder)
+        # an enabled mod is a link, so remove the link and then the mod it links to.
+        # Deleting the folder refuses links, so the files are never removed through one
+        if files.is_symlink(folder):
+            target = os.path.join(
+                files.get_mod_install_folder(), os.path.basename(folder)
+            )
+            files.delete_symlink(folder, update_func=update_func)
+            files.delete_folder(target, update_func=update_func)
+            self.invalidate_mods(folder, files.fix_path(target))
+            return True
+
         # delete folder
         files.delete_folder(folder, update_func=update_func)
+        self.invalidate_mods(folder)
         return True
 
     def enable_mod(self, folder, update_func=None):
         """Creates symlink in flight sim install."""
-        logger.debug("Enabling mod {}".format(folder))
+        logger.debug("Enabling mod {}", folder)
         src_folder = self.get_mod_folder(folder, enabled=False)
         dest_folder = self.get_mod_folder(folder, enabled=True)
 
         # create symlink to sim
         files.create_symlink(src_folder, dest_folder, update_func=update_func)
+        self.invalidate_mods(src_folder, dest_folder)
         return True
 
     def disable_mod(self, folder, update_func=None):
         """Deletes symlink/dopies mod folder into mod install location."""
-        logger.debug("Disabling mod {}".format(folder))
+        logger.debug("Disabling mod {}", folder)
         src_folder = self.get_mod_folder(folder, enabled=True)
         dest_folder = self.get_mod_folder(folder, enabled=False)
 
@@ -605,6 +778,7 @@ class flight_sim:
             # move mod to mod install location
             files.move_folder(src_folder, dest_folder, update_func=update_func)
 
+        self.invalidate_mods(src_folder, dest_folder)
         return True
 
     def create_backup(self, archive, update_func=None):
@@ -1,3 +1,6 @@
+import functools
+import inspect
+import time
 from contextlib import contextmanager
 
 import PySide2.QtCore as QtCore
@@ -28,6 +31,119 @@ class base_thread(QtCore.QThread):
         logger.debug("Thread completed")
 
 
+class base_runnable_signals(QtCore.QObject):
+    """Signals of the base thread pool task class.
+    QRunnable is not a QObject, so it cannot have signals of its own."""
+
+    activity_update = QtCore.Signal(object)
+    percent_update = QtCore.Signal(object)
+    finished = QtCore.Signal(object)
+    failed = QtCore.Signal(Exception)
+
+
+class base_runnable(QtCore.QRunnable):
+    """Base thread pool task class.
+    This has the same signals and interface as the base thread class,
+    but runs on the reused worker threads of the global thread pool."""
+
+    def __init__(self, function):
+        """Initialize the thread pool task."""
+        self.function = function
+        QtCore.QRunnable.__init__(self)
+
+        self.signals = base_runnable_signals()
+        self.activity_update = self.signals.activity_update
+        self.percent_update = self.signals.percent_update
+        self.finished = self.signals.finished
+        self.failed = self.signals.failed
+
+    def run(self):
+        """Run task."""
+        logger.debug("Running thread pool task")
+        try:
+            output = self.function()
+            self.finished.emit(output)
+        except Exception as e:
+            self.failed.emit(e)
+        logger.debug("Thread pool task completed")
+
+    def start(self):
+        """Queue the task on the global thread pool."""
+        QtCore.QThreadPool.globalInstance().start(self)
+
+
+class throttler:
+    """Wraps a function so it is called at most once per interval.
+    Calls made within the interval of the previous one are held back,
+    and only the latest of them is kept for flush."""
+
+    def __init__(self, function, interval=0.05):
+        """Initialize the throttler."""
+        self.function = function
+        self.interval = interval
+        self.last_call = None
+        self.pending = None
+
+    def __call__(self, *args, **kwargs):
+        """Call the function, if the interval has passed since the last call."""
+        now = time.monotonic()
+        if self.last_call is not None and now - self.last_call <= self.interval:
+            self.pending = (args, kwargs)
+            return
+
+        self.pending = None
+        self.last_call = now
+        self.function(*args, **kwargs)
+
+    def flush(self):
+        """Call the function with the latest held back call, if there is one.
+        This makes sure the final update is not lost."""
+        if self.pending is None:
+            return
+
+        args, kwargs = self.pending
+        self.pending = None
+        self.last_call = time.monotonic()
+        self.function(*args, **kwargs)
+
+    def wrap(self, function):
+        """Wraps a function that reports through this throttler,
+        so that the final update is sent once the function returns."""
+
+        def wrapper(*args, **kwargs):
+            output = function(*args, **kwargs)
+            self.flush()
+            return output
+
+        return wrapper
+
+
+class op_thread(base_runnable):
+    """Setup a thread to run an operation with and not block the main thread.
+    The progress signals are passed to the operation as update_func and
+    percent_func, for whichever of those it accepts."""
+
+    def __init__(self, function, *args, **kwargs):
+        """Initialize the operation thread."""
+        logger.debug(
+            "Initialzing thread for {}", getattr(function, "__name__", function)
+        )
+        base_runnable.__init__(self, function)
+
+        percent_func = None
+        parameters = inspect.signature(function).parameters
+        if "update_func" in parameters:
+            kwargs.setdefault("update_func", self.activity_update.emit)
+        if "percent_func" in parameters and "percent_func" not in kwargs:
+            # progress bar updates faster than the GUI redraws are wasted
+            percent_func = throttler(self.percent_update.emit)
+            kwargs["percent_func"] = percent_func
+
+        self.function = functools.partial(function, *args, **kwargs)
+        if percent_func:
+            self.function = percent_func.wrap(self.function)
+
+
 @contextmanager
 def thread_wait(
     finished_signal,
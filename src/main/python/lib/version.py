@@ -21,8 +21,10 @@ class download_new_version_thread(thread.base_thread):
     def __init__(self, asset_url):
         """Initialize the version downloader thread."""
         logger.debug("Initialzing version downloader thread")
-        function = lambda: download_new_version(
-            asset_url, percent_func=self.percent_update.emit
+        # progress bar updates faster than the GUI redraws are wasted
+        percent_func = thread.throttler(self.percent_update.emit)
+        function = percent_func.wrap(
+            lambda: download_new_version(asset_url, percent_func=percent_func)
         )
         thread.base_thread.__init__(self, function)
 
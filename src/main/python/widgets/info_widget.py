@@ -96,8 +96,9 @@ class info_widget(QtWidgets.QWidget):
         # misc data to hold onto
         self.mod_path = mod_data["full_path"]
 
+        # the files data already has every size, so avoid walking the folder again
         self.total_size_field.setText(
-            files.human_readable_size(files.get_folder_size(self.mod_path))
+            files.human_readable_size(sum(item["size"] for item in files_data))
         )
 
     def open_folder(self):
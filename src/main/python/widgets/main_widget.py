@@ -349,8 +349,8 @@ class main_widget(QtWidgets.QWidget):
                     )
 
                 # setup installer thread
-                installer = flight_sim.install_mod_archive_thread(
-                    self.flight_sim, mod_archive
+                installer = thread.op_thread(
+                    self.flight_sim.install_mod_archive, mod_archive
                 )
                 installer.activity_update.connect(progress.set_activity)
                 installer.percent_update.connect(progress.set_percent)
@@ -417,7 +417,7 @@ class main_widget(QtWidgets.QWidget):
                 )
 
             # setup installer thread
-            installer = flight_sim.install_mods_thread(self.flight_sim, mod_folder)
+            installer = thread.op_thread(self.flight_sim.install_mods, mod_folder)
             installer.activity_update.connect(progress.set_activity)
 
             # start the thread
@@ -454,8 +454,8 @@ class main_widget(QtWidgets.QWidget):
                 mod_folder = self.flight_sim.get_mod_folder(folder, enabled)
 
                 # setup uninstaller thread
-                uninstaller = flight_sim.uninstall_mod_thread(
-                    self.flight_sim, mod_folder
+                uninstaller = thread.op_thread(
+                    self.flight_sim.uninstall_mod, mod_folder
                 )
                 uninstaller.activity_update.connect(progress.set_activity)
 
@@ -494,7 +494,7 @@ class main_widget(QtWidgets.QWidget):
                     continue
 
                 # setup enabler thread
-                enabler = flight_sim.enable_mod_thread(self.flight_sim, folder)
+                enabler = thread.op_thread(self.flight_sim.enable_mod, folder)
                 enabler.activity_update.connect(progress.set_activity)
 
                 def failed(error):
@@ -528,7 +528,7 @@ class main_widget(QtWidgets.QWidget):
                     continue
 
                 # setup disabler thread
-                disabler = flight_sim.disable_mod_thread(self.flight_sim, folder)
+                disabler = thread.op_thread(self.flight_sim.disable_mod, folder)
                 disabler.activity_update.connect(progress.set_activity)
 
                 def failed(error):
@@ -568,7 +568,7 @@ class main_widget(QtWidgets.QWidget):
 
         def core(progress):
             # setup backuper thread
-            backuper = flight_sim.create_backup_thread(self.flight_sim, archive)
+            backuper = thread.op_thread(self.flight_sim.create_backup, archive)
             backuper.activity_update.connect(progress.set_activity)
 
             def finish(result):
@@ -639,9 +639,9 @@ class main_widget(QtWidgets.QWidget):
             if not automated:
                 self.flight_sim.clear_mod_cache()
 
-            # build list of mods
+            # build list of mods, parsing every mod again if a human clicked the button
             all_mods_data, all_mods_errors = self.flight_sim.get_all_mods(
-                progress_func=update
+                progress_func=update, force=not automated
             )
 
             # set data